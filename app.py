@@ -1,20 +1,10 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import pickle
+import joblib
 from preprocessing import preprocess_input
-import plotly.graph_objects as go
 
-# Page config
-st.set_page_config(
-    page_title="Churn Risk Predictor",
-    page_icon="🎯",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Simple, clean CSS
-st.markdown("""
+# Static page content
+_CSS = """
 <style>
     /* Clean white background */
     .main {
@@ -141,25 +131,215 @@ st.markdown("""
         padding: 10px !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_PERF_CARD_HTML = """
+<div class="card">
+    <div style="text-align: center;">
+        <div class="metric-value">85.8%</div>
+        <div class="metric-label">Recall Rate</div>
+        <hr style="margin: 20px 0;">
+        <div style="font-size: 1.1rem; font-weight: 600; line-height: 2;">
+            📈 Accuracy: 75-80%<br>
+            🎯 Precision: 47.3%<br>
+            💰 Savings: $173K/year
+        </div>
+    </div>
+</div>
+"""
+
+_RISK_FACTORS_HTML = """
+<div class="card">
+    <ol style="line-height: 2; font-weight: 500;">
+        <li>Month-to-month contract</li>
+        <li>Fiber without support</li>
+        <li>Electronic check payment</li>
+        <li>High monthly charges</li>
+        <li>New customer (&lt;12 months)</li>
+    </ol>
+</div>
+"""
+
+_SIDEBAR_MD = """
+### 🤖 Technology
+- XGBoost Algorithm
+- 40+ Features
+- 5,600+ Samples
+
+### 🎯 Performance
+- **85.8% Recall**
+- **75% Accuracy**
+- **$173K Savings/year**
+
+### 📈 Key Insights
+
+**High Risk Factors:**
+- Month-to-month contracts
+- Electronic check payments
+- Short tenure
+
+**Protection Factors:**
+- Long-term contracts
+- Tech support
+- Automatic payments
+"""
+
+# Page config
+st.set_page_config(
+    page_title="Churn Risk Predictor",
+    page_icon="🎯",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Simple, clean CSS
+st.markdown(_CSS, unsafe_allow_html=True)
 
 
 # Load models
 @st.cache_resource
 def load_models():
     try:
-        with open('churn_model.pkl', 'rb') as f:
-            model = pickle.load(f)
-        with open('scaler.pkl', 'rb') as f:
-            scaler = pickle.load(f)
+        model = joblib.load('churn_model.pkl', mmap_mode='r')
+        # Native booster; a single-row prediction gains nothing from threads
+        booster = model.get_booster()
+        booster.set_param({'nthread': 1})
+        scaler = joblib.load('scaler.pkl', mmap_mode='r')
         with open('threshold.pkl', 'rb') as f:
             threshold = pickle.load(f)
-        return model, scaler, threshold, True
+        return booster, scaler, threshold, True
     except Exception as e:
         return None, None, None, False
 
 
-model, scaler, threshold, models_loaded = load_models()
+booster, scaler, threshold, models_loaded = load_models()
+
+
+# Cached end-to-end prediction, keyed on the form inputs
+@st.cache_data(max_entries=256, show_spinner=False)
+def predict(contract, internet_service, tenure, monthly_charges, payment_method,
+            paperless_billing, online_security, tech_support):
+    total_charges = tenure * monthly_charges
+
+    input_dict = {
+        'Contract': contract, 'InternetService': internet_service, 'tenure': tenure,
+        'MonthlyCharges': monthly_charges, 'TotalCharges': total_charges,
+        'PaymentMethod': payment_method, 'PaperlessBilling': paperless_billing,
+        'OnlineSecurity': online_security if internet_service != 'No' else 'No internet service',
+        'TechSupport': tech_support if internet_service != 'No' else 'No internet service'
+    }
+
+    processed_arr = preprocess_input(input_dict, scaler)
+    churn_probability = float(booster.inplace_predict(processed_arr)[0])
+    will_churn = 1 if churn_probability >= threshold else 0
+    return churn_probability, will_churn
+
+
+# Results section (metrics, risk card, recommendations, gauge)
+def render_results(churn_probability, will_churn, threshold, contract, payment_method,
+                   internet_service, tech_support, online_security, monthly_charges, tenure):
+    st.markdown("---")
+    st.markdown("## 🎯 Prediction Results")
+
+    # Metrics
+    met1, met2, met3, met4 = st.columns(4)
+
+    with met1:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{churn_probability * 100:.1f}%</div>
+            <div class="metric-label">Churn Probability</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with met2:
+        risk_level = "HIGH" if will_churn else "LOW"
+        risk_color = "#e74c3c" if will_churn else "#27ae60"
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value" style="color: {risk_color};">{risk_level}</div>
+            <div class="metric-label">Risk Level</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with met3:
+        confidence = min(abs(churn_probability - threshold) / threshold * 100, 99)
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">{confidence:.0f}%</div>
+            <div class="metric-label">Confidence</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with met4:
+        expected_ltv = 0 if will_churn else 1532
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-value">${expected_ltv}</div>
+            <div class="metric-label">Expected LTV</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Risk assessment
+    if churn_probability >= 0.7:
+        risk_class = "risk-high"
+        title = "🚨 CRITICAL RISK"
+        message = "Immediate intervention required!"
+    elif churn_probability >= 0.4:
+        risk_class = "risk-medium"
+        title = "⚠️ MEDIUM RISK"
+        message = "Proactive retention recommended"
+    else:
+        risk_class = "risk-low"
+        title = "✅ LOW RISK"
+        message = "Customer likely to stay"
+
+    st.markdown(f"""
+    <div class="{risk_class}">
+        <h1 style="margin: 0; font-size: 2.5rem;">{title}</h1>
+        <h2 style="margin: 10px 0; font-size: 2rem;">{churn_probability * 100:.1f}% Churn Probability</h2>
+        <p style="font-size: 1.2rem; margin: 5px 0;">{message}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Recommendations
+    if will_churn:
+        st.markdown("### 💡 Recommended Actions")
+
+        rec_col1, rec_col2 = st.columns(2)
+
+        recommendations = []
+        if contract == "Month-to-month":
+            recommendations.append("📋 Offer 1-year contract with 20% discount")
+        if payment_method == "Electronic check":
+            recommendations.append("💳 Incentivize automatic payment switch")
+        if internet_service == "Fiber optic" and tech_support == "No":
+            recommendations.append("🛠️ Provide 3 months free tech support")
+        if online_security == "No":
+            recommendations.append("🔒 Offer online security at 50% off")
+        if monthly_charges > 70:
+            recommendations.append("💰 Review pricing/loyalty discount")
+        if tenure < 12:
+            recommendations.append("👥 Assign dedicated account manager")
+
+        for i, rec in enumerate(recommendations):
+            if i % 2 == 0:
+                rec_col1.success(rec)
+            else:
+                rec_col2.success(rec)
+
+    # Risk gauge (probability vs. threshold)
+    st.markdown("### 📊 Risk Gauge")
+
+    st.metric(
+        "Churn Probability", f"{churn_probability * 100:.1f}%",
+        delta=f"{(churn_probability - threshold) * 100:+.1f}pp vs threshold",
+        delta_color="inverse"
+    )
+    st.progress(churn_probability)
+
 
 # Header
 st.markdown('<div class="main-header">🎯 Customer Churn Predictor</div>', unsafe_allow_html=True)
@@ -175,33 +355,33 @@ col_left, col_right = st.columns([2, 1])
 with col_left:
     st.markdown("## 📝 Customer Information")
 
-    with st.form("churn_form"):
+    with st.form("churn_form", clear_on_submit=False):
         col1, col2, col3 = st.columns(3)
 
         with col1:
-            contract = st.selectbox("Contract Type", ["Month-to-month", "One year", "Two year"])
+            st.selectbox("Contract Type", ["Month-to-month", "One year", "Two year"], key='contract')
         with col2:
-            internet_service = st.selectbox("Internet Service", ["Fiber optic", "DSL", "No"])
+            st.selectbox("Internet Service", ["Fiber optic", "DSL", "No"], key='internet_service')
         with col3:
-            tenure = st.number_input("Tenure (months)", 0, 72, 12)
+            st.number_input("Tenure (months)", 0, 72, 12, key='tenure')
 
         col4, col5, col6 = st.columns(3)
 
         with col4:
-            monthly_charges = st.number_input("Monthly Charges ($)", 18.0, 120.0, 70.0, step=5.0)
+            st.number_input("Monthly Charges ($)", 18.0, 120.0, 70.0, step=5.0, key='monthly_charges')
         with col5:
-            payment_method = st.selectbox("Payment Method",
-                                          ["Electronic check", "Mailed check", "Bank transfer (automatic)",
-                                           "Credit card (automatic)"])
+            st.selectbox("Payment Method",
+                         ["Electronic check", "Mailed check", "Bank transfer (automatic)",
+                          "Credit card (automatic)"], key='payment_method')
         with col6:
-            paperless_billing = st.selectbox("Paperless Billing", ["Yes", "No"])
+            st.selectbox("Paperless Billing", ["Yes", "No"], key='paperless_billing')
 
         col7, col8 = st.columns(2)
 
         with col7:
-            online_security = st.selectbox("Online Security", ["No", "Yes"])
+            st.selectbox("Online Security", ["No", "Yes"], key='online_security')
         with col8:
-            tech_support = st.selectbox("Tech Support", ["No", "Yes"])
+            st.selectbox("Tech Support", ["No", "Yes"], key='tech_support')
 
         st.markdown("---")
         submitted = st.form_submit_button("🔮 Predict Churn Risk", use_container_width=True)
@@ -209,215 +389,40 @@ with col_left:
 with col_right:
     st.markdown("## 📊 Model Performance")
 
-    st.markdown("""
-    <div class="card">
-        <div style="text-align: center;">
-            <div class="metric-value">85.8%</div>
-            <div class="metric-label">Recall Rate</div>
-            <hr style="margin: 20px 0;">
-            <div style="font-size: 1.1rem; font-weight: 600; line-height: 2;">
-                📈 Accuracy: 75-80%<br>
-                🎯 Precision: 47.3%<br>
-                💰 Savings: $173K/year
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_PERF_CARD_HTML, unsafe_allow_html=True)
 
     st.markdown("### 🚨 Top Risk Factors")
-    st.markdown("""
-    <div class="card">
-        <ol style="line-height: 2; font-weight: 500;">
-            <li>Month-to-month contract</li>
-            <li>Fiber without support</li>
-            <li>Electronic check payment</li>
-            <li>High monthly charges</li>
-            <li>New customer (&lt;12 months)</li>
-        </ol>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_RISK_FACTORS_HTML, unsafe_allow_html=True)
 
 # Prediction Results
 if submitted:
-    total_charges = tenure * monthly_charges
-
-    input_dict = {
-        'Contract': contract, 'InternetService': internet_service, 'tenure': tenure,
-        'MonthlyCharges': monthly_charges, 'TotalCharges': total_charges,
-        'PaymentMethod': payment_method, 'PaperlessBilling': paperless_billing,
-        'OnlineSecurity': online_security if internet_service != 'No' else 'No internet service',
-        'TechSupport': tech_support if internet_service != 'No' else 'No internet service',
-        'gender': 'Female', 'SeniorCitizen': 0, 'Partner': 'No', 'Dependents': 'No',
-        'PhoneService': 'Yes', 'MultipleLines': 'No', 'OnlineBackup': 'No',
-        'DeviceProtection': 'No', 'StreamingTV': 'No', 'StreamingMovies': 'No'
-    }
-
-    input_df = pd.DataFrame([input_dict])
+    # Submitted values, read from the widgets' session-state keys
+    contract = st.session_state['contract']
+    internet_service = st.session_state['internet_service']
+    tenure = st.session_state['tenure']
+    monthly_charges = st.session_state['monthly_charges']
+    payment_method = st.session_state['payment_method']
+    paperless_billing = st.session_state['paperless_billing']
+    online_security = st.session_state['online_security']
+    tech_support = st.session_state['tech_support']
 
     try:
-        with st.spinner("🔄 Analyzing customer profile..."):
-            processed_df = preprocess_input(input_df, scaler)
-            churn_probability = model.predict_proba(processed_df)[0][1]
-            will_churn = 1 if churn_probability >= threshold else 0
-
-        st.markdown("---")
-        st.markdown("## 🎯 Prediction Results")
-
-        # Metrics
-        met1, met2, met3, met4 = st.columns(4)
-
-        with met1:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{churn_probability * 100:.1f}%</div>
-                <div class="metric-label">Churn Probability</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with met2:
-            risk_level = "HIGH" if will_churn else "LOW"
-            risk_color = "#e74c3c" if will_churn else "#27ae60"
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value" style="color: {risk_color};">{risk_level}</div>
-                <div class="metric-label">Risk Level</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with met3:
-            confidence = min(abs(churn_probability - threshold) / threshold * 100, 99)
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">{confidence:.0f}%</div>
-                <div class="metric-label">Confidence</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with met4:
-            expected_ltv = 0 if will_churn else 1532
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-value">${expected_ltv}</div>
-                <div class="metric-label">Expected LTV</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("<br>", unsafe_allow_html=True)
-
-        # Risk assessment
-        if churn_probability >= 0.7:
-            risk_class = "risk-high"
-            title = "🚨 CRITICAL RISK"
-            message = "Immediate intervention required!"
-        elif churn_probability >= 0.4:
-            risk_class = "risk-medium"
-            title = "⚠️ MEDIUM RISK"
-            message = "Proactive retention recommended"
-        else:
-            risk_class = "risk-low"
-            title = "✅ LOW RISK"
-            message = "Customer likely to stay"
-
-        st.markdown(f"""
-        <div class="{risk_class}">
-            <h1 style="margin: 0; font-size: 2.5rem;">{title}</h1>
-            <h2 style="margin: 10px 0; font-size: 2rem;">{churn_probability * 100:.1f}% Churn Probability</h2>
-            <p style="font-size: 1.2rem; margin: 5px 0;">{message}</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Recommendations
-        if will_churn:
-            st.markdown("### 💡 Recommended Actions")
-
-            rec_col1, rec_col2 = st.columns(2)
-
-            recommendations = []
-            if contract == "Month-to-month":
-                recommendations.append("📋 Offer 1-year contract with 20% discount")
-            if payment_method == "Electronic check":
-                recommendations.append("💳 Incentivize automatic payment switch")
-            if internet_service == "Fiber optic" and tech_support == "No":
-                recommendations.append("🛠️ Provide 3 months free tech support")
-            if online_security == "No":
-                recommendations.append("🔒 Offer online security at 50% off")
-            if monthly_charges > 70:
-                recommendations.append("💰 Review pricing/loyalty discount")
-            if tenure < 12:
-                recommendations.append("👥 Assign dedicated account manager")
-
-            for i, rec in enumerate(recommendations):
-                if i % 2 == 0:
-                    rec_col1.success(rec)
-                else:
-                    rec_col2.success(rec)
-
-        # Gauge chart
-        st.markdown("### 📊 Risk Gauge")
-
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number",
-            value=churn_probability * 100,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            title={'text': "Churn Probability", 'font': {'size': 24, 'color': '#2c3e50'}},
-            number={'font': {'size': 48, 'color': '#2c3e50'}},
-            gauge={
-                'axis': {'range': [None, 100], 'tickwidth': 2, 'tickcolor': "#2c3e50"},
-                'bar': {'color': "#3498db"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "#95a5a6",
-                'steps': [
-                    {'range': [0, 40], 'color': '#d4edda'},
-                    {'range': [40, 70], 'color': '#fff3cd'},
-                    {'range': [70, 100], 'color': '#f8d7da'}
-                ],
-                'threshold': {
-                    'line': {'color': "#e74c3c", 'width': 4},
-                    'thickness': 0.75,
-                    'value': threshold * 100
-                }
-            }
-        ))
-
-        fig.update_layout(
-            height=400,
-            margin=dict(l=20, r=20, t=50, b=20),
-            paper_bgcolor="white",
-            font={'color': "#2c3e50", 'family': "Arial"}
+        churn_probability, will_churn = predict(
+            contract, internet_service, tenure, monthly_charges, payment_method,
+            paperless_billing, online_security, tech_support
         )
 
-        st.plotly_chart(fig, use_container_width=True)
-
+        render_results(
+            churn_probability, will_churn, threshold, contract, payment_method,
+            internet_service, tech_support, online_security, monthly_charges, tenure
+        )
     except Exception as e:
         st.error(f"❌ Error making prediction: {e}")
 
 # Sidebar
 with st.sidebar:
     st.markdown("# ℹ️ About")
-    st.markdown("""
-    ### 🤖 Technology
-    - XGBoost Algorithm
-    - 40+ Features
-    - 5,600+ Samples
-
-    ### 🎯 Performance
-    - **85.8% Recall**
-    - **75% Accuracy**
-    - **$173K Savings/year**
-
-    ### 📈 Key Insights
-
-    **High Risk Factors:**
-    - Month-to-month contracts
-    - Electronic check payments
-    - Short tenure
-
-    **Protection Factors:**
-    - Long-term contracts
-    - Tech support
-    - Automatic payments
-    """)
+    st.markdown(_SIDEBAR_MD)
 
     st.markdown("---")
     st.caption("Built with Streamlit & XGBoost")
\ No newline at end of file
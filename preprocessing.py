@@ -2,173 +2,325 @@ import pandas as pd
 import numpy as np
 
 
-def preprocess_input(input_df, scaler):
+# Expected columns from training (in exact order)
+_EXPECTED_COLUMNS = (
+    'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure',
+    'PhoneService', 'MultipleLines', 'OnlineSecurity', 'OnlineBackup',
+    'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies',
+    'Contract', 'PaperlessBilling', 'MonthlyCharges', 'TotalCharges',
+    'IsNewCustomer', 'IsEstablished', 'IsLoyalCustomer',
+    'ChargePerTenureMonth', 'IsHighSpender', 'ChargeTenureRatio',
+    'TotalServices', 'ServiceDensity', 'HasMinimalServices',
+    'HighRiskProfile', 'SeniorNoSupport', 'SingleNoFamily',
+    'NewHighSpender', 'PaperlessElectronicCheck', 'HasAutoPay',
+    'FiberNoAddons', 'InternetService_Fiber optic', 'InternetService_No',
+    'PaymentMethod_Credit card (automatic)', 'PaymentMethod_Electronic check',
+    'PaymentMethod_Mailed check'
+)
+
+_COL_INDEX = {col: idx for idx, col in enumerate(_EXPECTED_COLUMNS)}
+
+# Engineered features (contiguous in training order, filled by _engineer)
+_ENGINEERED_COLUMNS = (
+    'IsNewCustomer', 'IsEstablished', 'IsLoyalCustomer',
+    'ChargePerTenureMonth', 'IsHighSpender', 'ChargeTenureRatio',
+    'TotalServices', 'ServiceDensity', 'HasMinimalServices',
+    'HighRiskProfile', 'SeniorNoSupport', 'SingleNoFamily',
+    'NewHighSpender', 'PaperlessElectronicCheck', 'HasAutoPay',
+    'FiberNoAddons'
+)
+_ENGINEERED = slice(_COL_INDEX[_ENGINEERED_COLUMNS[0]],
+                    _COL_INDEX[_ENGINEERED_COLUMNS[-1]] + 1)
+if _EXPECTED_COLUMNS[_ENGINEERED] != _ENGINEERED_COLUMNS:
+    raise ValueError("Engineered features must be contiguous in _EXPECTED_COLUMNS")
+
+# One-hot columns per category (None = dropped base level)
+_INTERNET_COLS = {
+    'DSL': None,
+    'Fiber optic': 'InternetService_Fiber optic',
+    'No': 'InternetService_No',
+}
+_PAYMENT_COLS = {
+    'Bank transfer (automatic)': None,
+    'Credit card (automatic)': 'PaymentMethod_Credit card (automatic)',
+    'Electronic check': 'PaymentMethod_Electronic check',
+    'Mailed check': 'PaymentMethod_Mailed check',
+}
+
+# Ordered categories; a value's code is its position (as in Categorical.codes)
+_YESNO_CATEGORIES = ('No', 'Yes')
+_GENDER_CATEGORIES = ('Female', 'Male')
+_CONTRACT_CATEGORIES = ('Month-to-month', 'One year', 'Two year')
+
+# Yes/No columns also carry "No internet/phone service"; these sit after
+# "Yes" so their codes (> 1) can be folded back to "No"
+_YESNO_SENTINEL_CATEGORIES = _YESNO_CATEGORIES + ('No internet service', 'No phone service')
+
+# Encoding maps ("No internet/phone service" counts as "No")
+_YESNO = {cat: code for code, cat in enumerate(_YESNO_CATEGORIES)}
+_YESNO.update({'No internet service': 0, 'No phone service': 0})
+_CONTRACT = {cat: code for code, cat in enumerate(_CONTRACT_CATEGORIES)}
+
+_YESNO_COLS = [
+    'Partner', 'Dependents', 'PhoneService', 'PaperlessBilling',
+    'MultipleLines', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+    'TechSupport', 'StreamingTV', 'StreamingMovies'
+]
+
+_SCALED_COLUMNS = ['tenure', 'MonthlyCharges', 'TotalCharges']
+
+# Profile fields the app's form doesn't ask for, folded to their encoded
+# defaults (Female, not senior, no partner/dependents, phone only)
+_BASE_GENDER = 0
+_BASE_SENIOR = 0
+_BASE_PARTNER = 0
+_BASE_DEPENDENTS = 0
+_BASE_PHONESERVICE = 1
+_BASE_MULTILINES = 0
+_BASE_ONLINE_BKP = 0
+_BASE_DEV_PROT = 0
+_BASE_STREAM_TV = 0
+_BASE_STREAM_MOV = 0
+
+_BASE_VALUES = {
+    'gender': _BASE_GENDER, 'SeniorCitizen': _BASE_SENIOR,
+    'Partner': _BASE_PARTNER, 'Dependents': _BASE_DEPENDENTS,
+    'PhoneService': _BASE_PHONESERVICE, 'MultipleLines': _BASE_MULTILINES,
+    'OnlineBackup': _BASE_ONLINE_BKP, 'DeviceProtection': _BASE_DEV_PROT,
+    'StreamingTV': _BASE_STREAM_TV, 'StreamingMovies': _BASE_STREAM_MOV,
+}
+
+# Output row with the folded profile columns already filled in
+_BASE_ROW = np.zeros(len(_EXPECTED_COLUMNS), dtype=np.float32)
+_BASE_ROW[[_COL_INDEX[col] for col in _BASE_VALUES]] = list(_BASE_VALUES.values())
+
+
+def _scale(values, scaler):
     """
-    Apply all preprocessing steps to match training data
+    StandardScaler.transform without sklearn's input validation
+    (values in _SCALED_COLUMNS order)
+    """
+    return (values - scaler.mean_) / scaler.scale_
+
+
+def _engineer(tenure, monthly, total, services, senior, single, paperless,
+              contract, no_security, no_support, has_fiber, has_internet_no,
+              has_echeck, has_auto_pay, out):
+    """
+    Write the engineered features into out (in _ENGINEERED_COLUMNS order)
+
+    Shared by preprocess_input (scalars, out is one row) and preprocess_batch
+    (arrays, out is a block of rows); flags are bools or boolean arrays.
+    services counts phone plus the add-on services, without internet.
+    """
+    tenure_p1 = tenure + 1
+
+    # Tenure-based features
+    is_new = tenure <= 12
+    out[..., 0] = is_new
+    out[..., 1] = (tenure > 12) & (tenure <= 24)
+    out[..., 2] = tenure > 48
+
+    # Charge-based features
+    is_high_spender = monthly > 70
+    out[..., 3] = total / tenure_p1
+    out[..., 4] = is_high_spender
+    out[..., 5] = monthly / tenure_p1
+
+    # Service bundle features
+    total_services = services + (1 - has_internet_no)
+
+    out[..., 6] = total_services
+    out[..., 7] = total_services / tenure_p1
+    out[..., 8] = total_services <= 2
+
+    # High-risk profiles
+    out[..., 9] = (contract == 0) & has_fiber & has_echeck
+    out[..., 10] = senior & no_support
+    out[..., 11] = single
+    out[..., 12] = is_new & is_high_spender
+
+    # Payment & billing features
+    out[..., 13] = paperless & has_echeck
+    out[..., 14] = has_auto_pay
+
+    # Internet service quality
+    out[..., 15] = has_fiber & no_security & no_support
+
+
+def preprocess_input(input_dict, scaler):
     """
+    Apply all preprocessing steps to match training data
+
+    Takes the app's form fields (plus TotalCharges); the profile fields the
+    form doesn't ask for use the _BASE_* defaults. Use preprocess_batch for
+    full customer records.
 
-    df = input_df.copy()
+    Returns a (1, n_features) float32 array in training column order
+    """
 
     # ============================================
-    # 1. BINARY ENCODING
+    # 1. BINARY & ORDINAL ENCODING
     # ============================================
-    df['gender'] = df['gender'].map({'Female': 0, 'Male': 1})
-    df['Partner'] = df['Partner'].map({'Yes': 1, 'No': 0})
-    df['Dependents'] = df['Dependents'].map({'Yes': 1, 'No': 0})
-    df['PhoneService'] = df['PhoneService'].map({'Yes': 1, 'No': 0})
-    df['PaperlessBilling'] = df['PaperlessBilling'].map({'Yes': 1, 'No': 0})
+    paperless = _YESNO[input_dict['PaperlessBilling']]
+    online_sec = _YESNO[input_dict['OnlineSecurity']]
+    tech_sup = _YESNO[input_dict['TechSupport']]
+    contract = _CONTRACT[input_dict['Contract']]
 
     # ============================================
-    # 2. HANDLE "NO SERVICE" CATEGORIES
+    # 2. ONE-HOT ENCODING
     # ============================================
-    df['MultipleLines'] = df['MultipleLines'].replace('No phone service', 'No')
-    df['OnlineSecurity'] = df['OnlineSecurity'].replace('No internet service', 'No')
-    df['OnlineBackup'] = df['OnlineBackup'].replace('No internet service', 'No')
-    df['DeviceProtection'] = df['DeviceProtection'].replace('No internet service', 'No')
-    df['TechSupport'] = df['TechSupport'].replace('No internet service', 'No')
-    df['StreamingTV'] = df['StreamingTV'].replace('No internet service', 'No')
-    df['StreamingMovies'] = df['StreamingMovies'].replace('No internet service', 'No')
+    internet_service = input_dict['InternetService']
+    payment_method = input_dict['PaymentMethod']
+
+    internet_col = _INTERNET_COLS[internet_service]
+    payment_col = _PAYMENT_COLS[payment_method]
 
-    # Encode to binary
-    df['MultipleLines'] = df['MultipleLines'].map({'Yes': 1, 'No': 0})
-    df['OnlineSecurity'] = df['OnlineSecurity'].map({'Yes': 1, 'No': 0})
-    df['OnlineBackup'] = df['OnlineBackup'].map({'Yes': 1, 'No': 0})
-    df['DeviceProtection'] = df['DeviceProtection'].map({'Yes': 1, 'No': 0})
-    df['TechSupport'] = df['TechSupport'].map({'Yes': 1, 'No': 0})
-    df['StreamingTV'] = df['StreamingTV'].map({'Yes': 1, 'No': 0})
-    df['StreamingMovies'] = df['StreamingMovies'].map({'Yes': 1, 'No': 0})
+    has_fiber = internet_service == 'Fiber optic'
+    has_internet_no = internet_service == 'No'
+    has_auto_pay = payment_method in ('Bank transfer (automatic)',
+                                      'Credit card (automatic)')
+    has_echeck = payment_method == 'Electronic check'
 
     # ============================================
-    # 3. ORDINAL ENCODING (Contract)
+    # 3. FEATURE ENGINEERING
     # ============================================
-    df['Contract'] = df['Contract'].map({
-        'Month-to-month': 0,
-        'One year': 1,
-        'Two year': 2
-    })
+
+    tenure = input_dict['tenure']
+    monthly = input_dict['MonthlyCharges']
+    total = input_dict['TotalCharges']
+
+    services = (_BASE_PHONESERVICE + online_sec + _BASE_ONLINE_BKP +
+                _BASE_DEV_PROT + tech_sup + _BASE_STREAM_TV + _BASE_STREAM_MOV)
+
+    row = _BASE_ROW.copy()
+    _engineer(tenure, monthly, total, services,
+              senior=_BASE_SENIOR == 1,
+              single=_BASE_PARTNER == 0 and _BASE_DEPENDENTS == 0,
+              paperless=paperless == 1, contract=contract,
+              no_security=input_dict['OnlineSecurity'] == 'No',
+              no_support=input_dict['TechSupport'] == 'No',
+              has_fiber=has_fiber, has_internet_no=has_internet_no,
+              has_echeck=has_echeck, has_auto_pay=has_auto_pay,
+              out=row[_ENGINEERED])
 
     # ============================================
-    # 4. ONE-HOT ENCODING
+    # 4. SCALING
     # ============================================
-    df = pd.get_dummies(df, columns=['InternetService', 'PaymentMethod'],
-                        drop_first=True, dtype=int)
+    scaled = _scale(np.array([tenure, monthly, total], dtype=np.float64), scaler)
 
     # ============================================
-    # 5. FEATURE ENGINEERING
+    # 5. BUILD ROW IN TRAINING COLUMN ORDER
     # ============================================
+    values = {
+        'tenure': scaled[0], 'MonthlyCharges': scaled[1],
+        'TotalCharges': scaled[2], 'OnlineSecurity': online_sec,
+        'TechSupport': tech_sup, 'Contract': contract,
+        'PaperlessBilling': paperless,
+    }
 
-    # Ensure numeric types
-    df['tenure'] = pd.to_numeric(df['tenure'])
-    df['MonthlyCharges'] = pd.to_numeric(df['MonthlyCharges'])
-    df['TotalCharges'] = pd.to_numeric(df['TotalCharges'])
-    df['SeniorCitizen'] = pd.to_numeric(df['SeniorCitizen'])
+    for col, value in values.items():
+        row[_COL_INDEX[col]] = value
 
-    # Tenure-based features
-    df['IsNewCustomer'] = (df['tenure'] <= 12).astype(int)
-    df['IsEstablished'] = ((df['tenure'] > 12) & (df['tenure'] <= 24)).astype(int)
-    df['IsLoyalCustomer'] = (df['tenure'] > 48).astype(int)
+    if internet_col is not None:
+        row[_COL_INDEX[internet_col]] = 1
+    if payment_col is not None:
+        row[_COL_INDEX[payment_col]] = 1
 
-    # Charge-based features
-    df['ChargePerTenureMonth'] = df['TotalCharges'] / (df['tenure'] + 1)
-    df['IsHighSpender'] = (df['MonthlyCharges'] > 70).astype(int)
-    df['ChargeTenureRatio'] = df['MonthlyCharges'] / (df['tenure'] + 1)
+    return row.reshape(1, -1)
 
-    # Service bundle features
-    has_internet_no = 1 if 'InternetService_No' in df.columns and df['InternetService_No'].iloc[0] == 1 else 0
-
-    df['TotalServices'] = (
-            df['PhoneService'].iloc[0] +
-            (1 - has_internet_no) +
-            df['OnlineSecurity'].iloc[0] +
-            df['OnlineBackup'].iloc[0] +
-            df['DeviceProtection'].iloc[0] +
-            df['TechSupport'].iloc[0] +
-            df['StreamingTV'].iloc[0] +
-            df['StreamingMovies'].iloc[0]
-    )
-
-    df['ServiceDensity'] = df['TotalServices'] / (df['tenure'] + 1)
-    df['HasMinimalServices'] = (df['TotalServices'] <= 2).astype(int)
 
-    # High-risk profiles
-    has_fiber = 1 if 'InternetService_Fiber optic' in df.columns and df['InternetService_Fiber optic'].iloc[
-        0] == 1 else 0
-    has_echeck = 1 if 'PaymentMethod_Electronic check' in df.columns and df['PaymentMethod_Electronic check'].iloc[
-        0] == 1 else 0
-
-    df['HighRiskProfile'] = int(
-        (df['Contract'].iloc[0] == 0) and
-        (has_fiber == 1) and
-        (has_echeck == 1)
-    )
-
-    df['SeniorNoSupport'] = int(
-        (df['SeniorCitizen'].iloc[0] == 1) and
-        (df['TechSupport'].iloc[0] == 0)
-    )
-
-    df['SingleNoFamily'] = int(
-        (df['Partner'].iloc[0] == 0) and
-        (df['Dependents'].iloc[0] == 0)
-    )
-
-    df['NewHighSpender'] = int(
-        (df['tenure'].iloc[0] <= 12) and
-        (df['MonthlyCharges'].iloc[0] > 70)
-    )
+def _codes(values, categories):
+    """
+    Categorical codes as floats, with unknown values left missing (NaN)
+    """
+    codes = pd.Categorical(values, categories=categories).codes.astype(np.float32)
+    codes[codes < 0] = np.nan
+    return codes
 
-    # Payment & billing features
-    df['PaperlessElectronicCheck'] = int(
-        (df['PaperlessBilling'].iloc[0] == 1) and
-        (has_echeck == 1)
-    )
 
-    has_bank = 1 if 'PaymentMethod_Bank transfer (automatic)' in df.columns and \
-                    df['PaymentMethod_Bank transfer (automatic)'].iloc[0] == 1 else 0
-    has_cc = 1 if 'PaymentMethod_Credit card (automatic)' in df.columns and \
-                  df['PaymentMethod_Credit card (automatic)'].iloc[0] == 1 else 0
+def preprocess_batch(input_df, scaler):
+    """
+    Apply all preprocessing steps to a batch of raw customer records
 
-    df['HasAutoPay'] = int((has_bank == 1) or (has_cc == 1))
+    Returns an (n_rows, n_features) float32 array in training column order
+    """
+    out = np.zeros((len(input_df), len(_EXPECTED_COLUMNS)), dtype=np.float32)
 
-    # Internet service quality
-    df['FiberNoAddons'] = int(
-        (has_fiber == 1) and
-        (df['OnlineSecurity'].iloc[0] == 0) and
-        (df['TechSupport'].iloc[0] == 0)
-    )
+    def put(col, values):
+        out[:, _COL_INDEX[col]] = values
 
     # ============================================
-    # 6. SCALING
+    # 1. BINARY & ORDINAL ENCODING
     # ============================================
-    cols_to_scale = ['tenure', 'MonthlyCharges', 'TotalCharges']
-    df[cols_to_scale] = scaler.transform(df[cols_to_scale])
+    yesno = _codes(input_df[_YESNO_COLS].to_numpy().ravel(),
+                   _YESNO_SENTINEL_CATEGORIES).reshape(-1, len(_YESNO_COLS))
+    yesno[yesno > 1] = 0
+    out[:, [_COL_INDEX[col] for col in _YESNO_COLS]] = yesno
+    put('gender', _codes(input_df['gender'], _GENDER_CATEGORIES))
+    put('SeniorCitizen', input_df['SeniorCitizen'].to_numpy())
+    put('Contract', _codes(input_df['Contract'], _CONTRACT_CATEGORIES))
 
     # ============================================
-    # 7. ENSURE CORRECT COLUMN ORDER & MISSING COLUMNS
+    # 2. ONE-HOT ENCODING
     # ============================================
+    internet_service = input_df['InternetService'].to_numpy()
+    payment_method = input_df['PaymentMethod'].to_numpy()
+
+    for category, col in _INTERNET_COLS.items():
+        if col is not None:
+            put(col, internet_service == category)
+    for category, col in _PAYMENT_COLS.items():
+        if col is not None:
+            put(col, payment_method == category)
 
-    # Expected columns from training (in exact order)
-    expected_columns = [
-        'gender', 'SeniorCitizen', 'Partner', 'Dependents', 'tenure',
-        'PhoneService', 'MultipleLines', 'OnlineSecurity', 'OnlineBackup',
-        'DeviceProtection', 'TechSupport', 'StreamingTV', 'StreamingMovies',
-        'Contract', 'PaperlessBilling', 'MonthlyCharges', 'TotalCharges',
-        'IsNewCustomer', 'IsEstablished', 'IsLoyalCustomer',
-        'ChargePerTenureMonth', 'IsHighSpender', 'ChargeTenureRatio',
-        'TotalServices', 'ServiceDensity', 'HasMinimalServices',
-        'HighRiskProfile', 'SeniorNoSupport', 'SingleNoFamily',
-        'NewHighSpender', 'PaperlessElectronicCheck', 'HasAutoPay',
-        'FiberNoAddons', 'InternetService_Fiber optic', 'InternetService_No',
-        'PaymentMethod_Credit card (automatic)', 'PaymentMethod_Electronic check',
-        'PaymentMethod_Mailed check'
-    ]
+    has_fiber = internet_service == 'Fiber optic'
+    has_internet_no = internet_service == 'No'
+    has_auto_pay = ((payment_method == 'Bank transfer (automatic)') |
+                    (payment_method == 'Credit card (automatic)'))
+    has_echeck = payment_method == 'Electronic check'
 
-    # Add missing columns with 0
-    for col in expected_columns:
-        if col not in df.columns:
-            df[col] = 0
+    # ============================================
+    # 3. FEATURE ENGINEERING
+    # ============================================
 
-    # Reorder columns to match training
-    df = df[expected_columns]
+    tenure = input_df['tenure'].to_numpy(np.float64)
+    monthly = input_df['MonthlyCharges'].to_numpy(np.float64)
+
+    # Blank TotalCharges (brand-new customers in the raw Telco export) is
+    # filled with tenure x MonthlyCharges, as in training
+    total = pd.to_numeric(input_df['TotalCharges'], errors='coerce').to_numpy(np.float64, copy=True)
+    missing = np.isnan(total)
+    total[missing] = tenure[missing] * monthly[missing]
+
+    # Compared on the raw strings, as in training: 'No internet service'
+    # encodes to 0 but does not count as "No" here
+    no_security = input_df['OnlineSecurity'].to_numpy() == 'No'
+    no_support = input_df['TechSupport'].to_numpy() == 'No'
+
+    # Counted on the raw "Yes" values too, so a blank cell counts as no
+    # service instead of turning the count into NaN
+    services = (input_df[[
+        'PhoneService', 'OnlineSecurity', 'OnlineBackup', 'DeviceProtection',
+        'TechSupport', 'StreamingTV', 'StreamingMovies'
+    ]].to_numpy() == 'Yes').sum(axis=1)
+
+    _engineer(tenure, monthly, total, services,
+              senior=input_df['SeniorCitizen'].to_numpy() == 1,
+              single=((out[:, _COL_INDEX['Partner']] == 0) &
+                      (out[:, _COL_INDEX['Dependents']] == 0)),
+              paperless=out[:, _COL_INDEX['PaperlessBilling']] == 1,
+              contract=out[:, _COL_INDEX['Contract']],
+              no_security=no_security, no_support=no_support,
+              has_fiber=has_fiber, has_internet_no=has_internet_no,
+              has_echeck=has_echeck, has_auto_pay=has_auto_pay,
+              out=out[:, _ENGINEERED])
+
+    # ============================================
+    # 4. SCALING
+    # ============================================
+    scaled = _scale(np.column_stack([tenure, monthly, total]), scaler)
+    for idx, col in enumerate(_SCALED_COLUMNS):
+        put(col, scaled[:, idx])
 
-    return df
\ No newline at end of file
+    return out